@@ -9,8 +9,12 @@ Features:
 - List all repositories in registry
 - Clean up specific repositories or patterns (e.g., bdtemp*)
 - Proper manifest deletion using Docker Registry v2 API
+- OCI referrers (signatures, SBOMs) deleted along with their images
+- Concurrent tag and repository processing (threaded, or asyncio with --async)
 - Support for authentication
 - Dry-run mode for safety
+- Optional whole-repository deletion on registries that support it (Harbor)
+- Optional on-disk cache for tag listings and interrupted cleanups
 - Comprehensive logging
 - Error handling and retry logic
 
@@ -21,236 +25,925 @@ Usage:
     python3 cleanup_registry.py --registry https://registry.cluster:5000 --dry-run
 
 Requirements:
-    pip install requests
+    pip install 'httpx[http2]'
+    pip install ijson  # optional, stream-parses very large listings
+    pip install diskcache  # optional, caches tag listings and resumes interrupted runs
 """
 
 import argparse
+import asyncio
+import itertools
 import json
+import logging
+import logging.handlers
+import os
 import re
 import sys
-from typing import List, Optional, Dict, Tuple
-import requests
-import urllib3
-from urllib.parse import urlparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Optional, Dict, Set, Tuple
+import httpx
+from urllib.parse import quote, urlparse
 
-# Disable SSL warnings for self-signed certificates
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+logger = logging.getLogger('registry-cleanup')
+
+# Manifest media types accepted when resolving a tag to its digest. Manifest
+# lists and indexes are included so multi-arch tags resolve to the digest the
+# tag actually points at rather than a single platform's manifest.
+MANIFEST_TYPES = [
+    'application/vnd.docker.distribution.manifest.v2+json',
+    'application/vnd.docker.distribution.manifest.list.v2+json',
+    'application/vnd.docker.distribution.manifest.v1+json',
+    'application/vnd.oci.image.manifest.v1+json',
+    'application/vnd.oci.image.index.v1+json'
+]
+
+# Number of tags processed concurrently within a single repository
+TAG_WORKERS = 16
+
+# Number of repositories cleaned up concurrently by a pattern cleanup, and the
+# per-repository tag workers used underneath it (8 x 4 stays within POOL_SIZE)
+REPOSITORY_WORKERS = 8
+NESTED_TAG_WORKERS = 4
+
+# Number of entries requested per page from paginated list endpoints
+PAGE_SIZE = 1000
+
+# Number of repositories shown by --info
+INFO_REPOSITORY_LIMIT = 10
+
+# Listing responses larger than this (or of unknown size) are stream-parsed
+# with ijson when it is installed, instead of being buffered by response.json()
+STREAM_PARSE_THRESHOLD = 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Default location of the on-disk cache (used when diskcache is installed)
+DEFAULT_CACHE_DIR = '~/.cache/registry-cleanup'
+CACHE_EXPIRE = 7 * 24 * 60 * 60
+
+# Log records buffered before writing when output is redirected
+LOG_BUFFER_SIZE = 256
+
+# Connection limit; must stay above the number of concurrent workers. Over
+# HTTPS the requests are multiplexed on a single HTTP/2 connection instead.
+POOL_SIZE = 32
+
+# Maximum requests in flight when cleaning up with --async (no threads involved)
+ASYNC_CONCURRENCY = 64
+
+# Per-request timeout in seconds
+REQUEST_TIMEOUT = 60.0
+
+# Transient failures are retried with exponential backoff
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+def _wildcard_to_regex(pattern: str) -> 're.Pattern':
+    """Compile a shell-style pattern (* and ? wildcards) into an anchored regex."""
+    regex_pattern = re.escape(pattern).replace(r'\*', '.*').replace(r'\?', '.')
+    return re.compile(f'^{regex_pattern}$')
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Return the literal part of a shell-style pattern before its first wildcard."""
+    return re.split(r'[*?]', pattern, maxsplit=1)[0]
+
+
+def _distribution_sort_key(name: str) -> str:
+    """Sort key matching Docker distribution's catalog order, where '/' sorts first."""
+    return name.replace('/', '\x00')
 
 
 class RegistryCleanup:
     def __init__(self, registry_url: str, username: Optional[str] = None,
-                 password: Optional[str] = None, verify_ssl: bool = False, dry_run: bool = False):
+                 password: Optional[str] = None, verify_ssl: bool = False, dry_run: bool = False,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR, assume_yes: bool = False,
+                 use_async: bool = False, bulk: bool = False):
         """Initialize the registry cleanup client."""
         self.registry_url = registry_url.rstrip('/')
+        self._base = self.registry_url + '/v2'
         self.verify_ssl = verify_ssl
         self.dry_run = dry_run
-        self.session = requests.Session()
+        self.assume_yes = assume_yes
+        self.use_async = use_async
+
+        # One HTTP/2 client lets every worker thread share a single TLS connection
+        self.client = httpx.Client(
+            http2=True,
+            verify=verify_ssl,
+            auth=(username, password) if username and password else None,
+            limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+            timeout=REQUEST_TIMEOUT,
+            follow_redirects=True
+        )
+
+        # Cache tag listings and in-progress deletions across runs when available
+        self.cache = None
+        if cache_dir and diskcache is not None:
+            self.cache = diskcache.Cache(os.path.expanduser(cache_dir))
 
-        # Setup authentication if provided
         if username and password:
-            self.session.auth = (username, password)
-            print(f"✓ Using authentication for user: {username}")
+            logger.info(f"✓ Using authentication for user: {username}")
 
-        # Setup SSL verification
         if not verify_ssl:
-            self.session.verify = False
-            print("⚠ SSL verification disabled")
+            logger.warning("⚠ SSL verification disabled")
+
+        logger.info(f"📡 Registry URL: {self.registry_url}")
+        logger.info(f"🔍 Dry run mode: {'ENABLED' if dry_run else 'DISABLED'}")
+        if self.cache is not None:
+            logger.info(f"💾 Cache directory: {self.cache.directory}")
 
-        print(f"📡 Registry URL: {self.registry_url}")
-        print(f"🔍 Dry run mode: {'ENABLED' if dry_run else 'DISABLED'}")
+        # Whole-repository deletion is vendor specific, so only use it when asked and supported
+        self.bulk_delete = bulk and self._supports_bulk_delete()
 
-    def _make_request(self, method: str, path: str, **kwargs) -> requests.Response:
-        """Make HTTP request to registry with error handling."""
-        url = f"{self.registry_url}/v2{path}"
+        # Whether the registry implements the OCI referrers API; None until first asked
+        self._referrers_supported = None
+
+        # Set on Ctrl-C so workers still running stop sending deletes
+        self._stop = threading.Event()
+
+    def _make_request(self, method: str, path: str, stream: bool = False, **kwargs) -> httpx.Response:
+        """Make HTTP request to the registry's v2 API with error handling."""
+        return self._send(method, self._base + path, stream=stream, **kwargs)
+
+    def _request_nonraising(self, method: str, path: str, ok_status: Tuple[int, ...] = (200,),
+                            **kwargs) -> Tuple[Optional[httpx.Response], Optional[int]]:
+        """Make a v2 API request whose failure status is an expected outcome.
+
+        Returns (response, None) for a status in ok_status and (None, status)
+        otherwise, so hot paths such as manifest HEADs that routinely miss
+        do not pay for building an exception. Transport errors still raise.
+        """
+        response = self._send_with_retries(method, self._base + path, **kwargs)
+        if response.status_code in ok_status:
+            return response, None
+        return None, response.status_code
+
+    def _send_with_retries(self, method: str, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+        """Send an HTTP request, retrying transport errors and transient server errors."""
+        for attempt in range(RETRY_ATTEMPTS + 1):
+            request = self.client.build_request(method, url, **kwargs)
+            try:
+                response = self.client.send(request, stream=stream)
+            except httpx.TransportError as e:
+                if attempt == RETRY_ATTEMPTS:
+                    raise
+                logger.debug(f"Retrying {method} {url} after {e}")
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == RETRY_ATTEMPTS:
+                    return response
+                response.close()
+                logger.debug(f"Retrying {method} {url} after HTTP {response.status_code}")
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+    def _send(self, method: str, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+        """Send an HTTP request, retrying transient failures and raising on errors.
+
+        With stream=True the body is left unread and the caller must close the response.
+        """
         try:
-            response = self.session.request(method, url, **kwargs)
-            response.raise_for_status()
+            response = self._send_with_retries(method, url, stream=stream, **kwargs)
+
+            # Only errors raise; a 304 from a conditional request is a normal answer
+            if response.is_error:
+                response.close()
+                response.raise_for_status()
             return response
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Request failed: {method} {url} - {e}")
+        except httpx.HTTPError as e:
+            logger.error(f"❌ Request failed: {method} {url} - {e}")
             raise
 
-    def list_repositories(self) -> List[str]:
-        """List all repositories in the registry."""
-        print("\n📋 Listing all repositories...")
+    def _supports_bulk_delete(self) -> bool:
+        """Probe for a registry API that can delete a whole repository in one request."""
+        # A plain GET: a 404 here is the expected answer from most registries
         try:
-            response = self._make_request('GET', '/_catalog')
-            data = response.json()
-            repositories = data.get('repositories', [])
-            print(f"✓ Found {len(repositories)} repositories")
-            return repositories
+            response = self.client.get(f"{self.registry_url}/api/v2.0/systeminfo")
+            version = response.json().get('harbor_version') if response.is_success else None
+        except Exception:
+            version = None
+
+        if version:
+            logger.info(f"✓ Harbor {version} detected; repositories will be deleted in a single request")
+            return True
+        logger.warning("⚠ Registry has no bulk repository delete API; falling back to per-tag deletion")
+        return False
+
+    def _bulk_delete_repository(self, repository: str, tags: List[str]) -> Optional[Tuple[int, int]]:
+        """Delete a repository with Harbor's repository API, or return None to fall back."""
+        project, _, name = repository.partition('/')
+        if not name:
+            logger.warning(f"  ⚠ '{repository}' is not inside a Harbor project; deleting tags individually")
+            return None
+
+        if self.dry_run:
+            logger.info(f"  🔍 DRY RUN: Would delete repository {repository} ({len(tags)} tags)")
+            return len(tags), 0
+        if self._stop.is_set():
+            return 0, len(tags)
+
+        # Harbor expects slashes in the repository name to be encoded twice
+        encoded_name = quote(quote(name, safe=''), safe='')
+        try:
+            self._send('DELETE', f"{self.registry_url}/api/v2.0/projects/{quote(project, safe='')}"
+                                 f"/repositories/{encoded_name}")
+            logger.info(f"  ✓ Deleted repository {repository} ({len(tags)} tags)")
+            return len(tags), 0
         except Exception as e:
-            print(f"❌ Failed to list repositories: {e}")
-            return []
+            logger.error(f"  ❌ Failed to delete repository {repository}: {e}")
+            return 0, len(tags)
+
+    def _next_page_path(self, response: httpx.Response) -> Optional[str]:
+        """Return the request path of the next page advertised in the Link header."""
+        next_url = response.links.get('next', {}).get('url')
+        if not next_url:
+            return None
+
+        # The Link target is relative to the registry root (e.g. /v2/_catalog?n=1000&last=foo)
+        parsed = urlparse(next_url)
+        path = parsed.path
+        if path.startswith('/v2'):
+            path = path[len('/v2'):]
+        if parsed.query:
+            path += f'?{parsed.query}'
+        return path
+
+    def _paginate(self, path: str, key: str, page_size: int = PAGE_SIZE,
+                  response: Optional[httpx.Response] = None, last: Optional[str] = None) -> Iterator[str]:
+        """Yield the entries of a paginated list endpoint, following Link headers.
+
+        If response is given it is used as the already-fetched first page.
+        Otherwise listing starts after the entry named by last, if any.
+        """
+        if response is None:
+            params = {'n': page_size}
+            if last:
+                params['last'] = last
+            response = self._make_request('GET', path, params=params, stream=True)
+        while True:
+            yield from self._iter_items(response, key)
+
+            next_path = self._next_page_path(response)
+            if not next_path:
+                return
+            response = self._make_request('GET', next_path, stream=True)
+
+    def _iter_items(self, response: httpx.Response, key: str) -> Iterator[str]:
+        """Yield the entries of a list response, stream-parsing large bodies."""
+        try:
+            length = response.headers.get('Content-Length')
+            if ijson is None or (length is not None and int(length) <= STREAM_PARSE_THRESHOLD):
+                response.read()
+                yield from response.json().get(key) or []
+                return
+
+            # Parse entries as chunks arrive so callers can start filtering
+            # before the whole body has been received
+            items = ijson.sendable_list()
+            parser = ijson.items_coro(items, f'{key}.item')
+            for chunk in response.iter_bytes(chunk_size=STREAM_CHUNK_SIZE):
+                parser.send(chunk)
+                yield from items
+                del items[:]
+            parser.close()
+            yield from items
+        finally:
+            response.close()
+
+    def list_repositories(self, page_size: int = PAGE_SIZE, last: Optional[str] = None) -> Iterator[str]:
+        """Yield all repositories in the registry (after last, if given), one catalog page at a time."""
+        logger.info("📋 Listing all repositories...")
+        count = 0
+        try:
+            for repository in self._paginate('/_catalog', 'repositories', page_size, last=last):
+                count += 1
+                yield repository
+        except Exception as e:
+            logger.error(f"❌ Failed to list repositories: {e}")
+            return
+        logger.info(f"✓ Found {count} repositories")
+
+    def list_repositories_with_prefix(self, prefix: str) -> Iterator[str]:
+        """Yield only the repositories whose names start with prefix.
+
+        The catalog is returned in lexical order, so listing starts at the
+        prefix minus its last character (which sorts before every match
+        under any such order) and stops once the matching run has ended.
+        Docker distribution sorts '/' before every other character while
+        other registries use plain byte order, so a name is only treated as
+        past the prefix when both orders agree or a match has already been
+        seen (names sharing a prefix are contiguous in either order).
+        """
+        if not prefix:
+            yield from self.list_repositories()
+            return
+
+        seen_match = False
+        for repository in self.list_repositories(last=prefix[:-1]):
+            if repository.startswith(prefix):
+                seen_match = True
+                yield repository
+            elif seen_match or (repository > prefix and
+                                _distribution_sort_key(repository) > _distribution_sort_key(prefix)):
+                break
+
+    def get_catalog_count(self) -> Optional[int]:
+        """Return the total number of repositories if the registry reports it, else None."""
+        # The v2 API has no count; some registries add X-Total-Count to catalog responses
+        try:
+            response = self.client.head(self._base + '/_catalog', params={'n': 1})
+            return int(response.headers['X-Total-Count'])
+        except (httpx.HTTPError, KeyError, ValueError):
+            return None
+
+    def _count_catalog_after(self, last: str) -> Optional[int]:
+        """Count the catalog entries after last by streaming full pages, or None on failure."""
+        try:
+            return sum(1 for _ in self._paginate('/_catalog', 'repositories', last=last))
+        except Exception as e:
+            logger.warning(f"  ⚠ Failed to count repositories: {e}")
+            return None
 
     def list_tags(self, repository: str) -> List[str]:
         """List all tags for a specific repository."""
         try:
-            response = self._make_request('GET', f'/{repository}/tags/list')
-            data = response.json()
-            tags = data.get('tags', [])
+            tags = self._fetch_tags(repository)
             if tags:
-                print(f"  📦 Repository '{repository}' has {len(tags)} tags")
+                logger.info(f"  📦 Repository '{repository}' has {len(tags)} tags")
                 return tags
             else:
-                print(f"  📦 Repository '{repository}' has no tags")
+                logger.info(f"  📦 Repository '{repository}' has no tags")
                 return []
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
-                print(f"  📦 Repository '{repository}' not found")
+                logger.info(f"  📦 Repository '{repository}' not found")
                 return []
             raise
         except Exception as e:
-            print(f"❌ Failed to list tags for '{repository}': {e}")
+            logger.error(f"❌ Failed to list tags for '{repository}': {e}")
             return []
 
+    def _fetch_tags(self, repository: str) -> List[str]:
+        """Fetch a repository's tags, revalidating a cached listing by its ETag."""
+        path = f'/{repository}/tags/list'
+        key = ('tags', self.registry_url, repository)
+        cached = self.cache.get(key) if self.cache is not None else None
+
+        headers = {'If-None-Match': cached[0]} if cached else {}
+        response = self._make_request('GET', path, params={'n': PAGE_SIZE}, headers=headers, stream=True)
+        if response.status_code == 304:
+            response.close()
+            return cached[1]
+
+        # Only single-page listings are cached; the ETag covers the first page alone
+        etag = response.headers.get('ETag')
+        single_page = 'next' not in response.links
+        tags = list(self._paginate(path, 'tags', response=response))
+        if self.cache is not None and etag and single_page:
+            self.cache.set(key, (etag, tags), expire=CACHE_EXPIRE)
+        return tags
+
+    def _deletion_key(self, repository: str, tag: str) -> Tuple[str, str, str, str]:
+        """Cache key recording which manifest of a tag an unfinished run deleted."""
+        return ('deleted', self.registry_url, repository, tag)
+
+    def _deletion_group(self, repository: str) -> str:
+        """Cache tag grouping a repository's deletion records for eviction."""
+        return f'deleted:{self.registry_url}/{repository}'
+
+    def repository_exists(self, repository: str) -> bool:
+        """Check whether a repository exists without listing the catalog."""
+        try:
+            self._make_request('GET', f'/{repository}/tags/list', params={'n': 1})
+            return True
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return False
+            raise
+
     def get_manifest_digest(self, repository: str, tag: str) -> Optional[str]:
         """Get the digest for a specific manifest."""
-        # Try different manifest types
-        manifest_types = [
-            'application/vnd.docker.distribution.manifest.v2+json',
-            'application/vnd.docker.distribution.manifest.v1+json',
-            'application/vnd.oci.image.manifest.v1+json'
-        ]
-
-        for manifest_type in manifest_types:
-            try:
-                response = self._make_request(
-                    'HEAD',
-                    f'/{repository}/manifests/{tag}',
-                    headers={'Accept': manifest_type}
-                )
-                digest = response.headers.get('Docker-Content-Digest')
-                if digest:
-                    return digest
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 404:
-                    continue  # Try next manifest type
-                raise
-            except Exception as e:
-                continue  # Try next manifest type
+        # Advertise every manifest type at once and let the registry negotiate,
+        # so a tag costs one round trip whatever its manifest type
+        response, status = self._request_nonraising(
+            'HEAD',
+            f'/{repository}/manifests/{tag}',
+            headers={'Accept': ', '.join(MANIFEST_TYPES)}
+        )
+        return self._digest_from_head(repository, tag, response, status)
+
+    def _digest_from_head(self, repository: str, tag: str, response: Optional[httpx.Response],
+                          status: Optional[int]) -> Optional[str]:
+        """Extract the digest from a manifest HEAD result, logging why there is none."""
+        if response is not None:
+            digest = response.headers.get('Docker-Content-Digest')
+            if digest:
+                return digest
+        elif status != 404:
+            logger.error(f"    ❌ Failed to resolve {repository}:{tag}: HTTP {status}")
+            return None
 
-        print(f"    ⚠ No digest found for {repository}:{tag} (tried all manifest types)")
+        logger.warning(f"    ⚠ No digest found for {repository}:{tag}")
         return None
 
     def delete_manifest(self, repository: str, digest: str) -> bool:
         """Delete a manifest by its digest."""
         if self.dry_run:
-            print(f"    🔍 DRY RUN: Would delete manifest {digest}")
+            logger.info(f"    🔍 DRY RUN: Would delete manifest {repository}@{digest}")
             return True
+        if self._stop.is_set():
+            return False
 
         try:
-            response = self._make_request('DELETE', f'/{repository}/manifests/{digest}')
-            if response.status_code in [202, 204]:
-                print(f"    ✓ Deleted manifest {digest}")
-                return True
-            else:
-                print(f"    ⚠ Unexpected response {response.status_code} for {digest}")
-                return False
+            _, status = self._request_nonraising('DELETE', f'/{repository}/manifests/{digest}',
+                                                 ok_status=(202, 204))
         except Exception as e:
-            print(f"    ❌ Failed to delete manifest {digest}: {e}")
+            logger.error(f"    ❌ Failed to delete manifest {repository}@{digest}: {e}")
             return False
+        return self._deletion_succeeded(repository, digest, status)
+
+    def _deletion_succeeded(self, repository: str, digest: str, status: Optional[int]) -> bool:
+        """Log the outcome of a manifest DELETE and report whether it succeeded."""
+        if status is None:
+            logger.info(f"    ✓ Deleted manifest {repository}@{digest}")
+            return True
+        if status < 400:
+            logger.warning(f"    ⚠ Unexpected response {status} for {repository}@{digest}")
+        else:
+            logger.error(f"    ❌ Failed to delete manifest {repository}@{digest}: HTTP {status}")
+        return False
+
+    def _parse_referrers(self, response: Optional[httpx.Response], status: Optional[int]) -> List[str]:
+        """Extract referrer digests from a referrers API result, noting when the API is missing."""
+        if response is None:
+            # Registries implementing the referrers API never answer it with a 404
+            if status == 404 and self._referrers_supported is None:
+                logger.info("  📎 Registry does not support the OCI referrers API")
+                self._referrers_supported = False
+            return []
+
+        # Anything but an image index (e.g. a proxy or UI fallback page) means the
+        # API is not really there; referrer lookup must never stop the cleanup itself
+        try:
+            manifests = response.json().get('manifests')
+        except (ValueError, AttributeError):
+            manifests = None
+        if not isinstance(manifests, list):
+            if self._referrers_supported is None:
+                logger.info("  📎 Registry does not support the OCI referrers API")
+            self._referrers_supported = False
+            return []
+
+        self._referrers_supported = True
+        return [manifest['digest'] for manifest in manifests
+                if isinstance(manifest, dict) and isinstance(manifest.get('digest'), str)]
+
+    def list_referrers(self, repository: str, digest: str) -> List[str]:
+        """List the digests of manifests (signatures, SBOMs, ...) that refer to a manifest."""
+        if self._referrers_supported is False:
+            return []
+        try:
+            response, status = self._request_nonraising(
+                'GET',
+                f'/{repository}/referrers/{digest}',
+                headers={'Accept': 'application/vnd.oci.image.index.v1+json'}
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"    ⚠ Failed to list referrers of {repository}@{digest}: {e}")
+            return []
+        return self._parse_referrers(response, status)
+
+    def _collect_referrers(self, executor: ThreadPoolExecutor, repository: str, digests: Set[str]) -> Set[str]:
+        """Find every manifest that refers, directly or transitively, to one of digests."""
+        referrers = set()
+        frontier = set(digests)
+        while frontier and self._referrers_supported is not False and not self._stop.is_set():
+            found = set()
+            for children in executor.map(lambda digest: self.list_referrers(repository, digest), frontier):
+                found.update(children)
+            frontier = found - referrers - digests
+            referrers |= frontier
+        return referrers
+
+    def _resolve_tag(self, repository: str, tag: str) -> Optional[str]:
+        """Resolve a tag to the digest of the manifest it points at."""
+        if self._stop.is_set():
+            return None
+        logger.debug(f"  🏷 Processing tag: {repository}:{tag}")
+        return self.get_manifest_digest(repository, tag)
+
+    def _skip_resumed(self, repository: str, digests: Dict[str, str]) -> Tuple[Dict[str, str], int]:
+        """Drop tags that still resolve to a manifest an interrupted run already deleted."""
+        if self.cache is None or self.dry_run:
+            return digests, 0
+
+        # Only the recorded digest counts; a tag pushed again since then must be deleted again
+        pending = {tag: digest for tag, digest in digests.items()
+                   if self.cache.get(self._deletion_key(repository, tag)) != digest}
+        resumed_count = len(digests) - len(pending)
+        if resumed_count:
+            logger.info(f"  💾 {repository}: skipping {resumed_count} tags deleted by a previous run")
+        return pending, resumed_count
+
+    def _record_deletion(self, repository: str, digests: Dict[str, str], digest: str):
+        """Remember the tags of a deleted manifest so a resumed run need not delete it again."""
+        if self.cache is None or self.dry_run:
+            return
+
+        for tag, tag_digest in digests.items():
+            if tag_digest == digest:
+                self.cache.set(self._deletion_key(repository, tag), digest,
+                               expire=CACHE_EXPIRE, tag=self._deletion_group(repository))
+
+    def _finish_repository(self, repository: str, digests: Dict[str, str], deleted: Dict[str, bool],
+                           resumed_count: int, failed_count: int) -> Tuple[int, int]:
+        """Map manifest deletion results back onto tags and report the repository totals."""
+        tags_deleted = sum(1 for digest in digests.values() if deleted[digest])
+        deleted_count = resumed_count + tags_deleted
+        failed_count += len(digests) - tags_deleted
+
+        # The repository is done, so nothing is left to resume
+        if self.cache is not None and not self.dry_run and not self._stop.is_set():
+            self.cache.evict(self._deletion_group(repository))
 
-    def cleanup_repository(self, repository: str) -> Tuple[int, int]:
+        logger.info(f"  📊 Repository '{repository}': {deleted_count} deleted, {failed_count} failed")
+        return deleted_count, failed_count
+
+    def _abandon(self, executor: ThreadPoolExecutor):
+        """Stop sending deletes and drop queued work instead of waiting for it (e.g. on Ctrl-C)."""
+        self._stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def cleanup_repository(self, repository: str, tag_workers: int = TAG_WORKERS) -> Tuple[int, int]:
         """Clean up all tags in a specific repository."""
-        print(f"\n🧹 Cleaning up repository: {repository}")
+        logger.info(f"🧹 Cleaning up repository: {repository}")
 
         tags = self.list_tags(repository)
         if not tags:
             return 0, 0
 
-        deleted_count = 0
+        if self.bulk_delete:
+            result = self._bulk_delete_repository(repository, tags)
+            if result is not None:
+                return result
+
+        digests = {}
         failed_count = 0
 
-        for tag in tags:
-            print(f"  🏷 Processing tag: {tag}")
+        # Not a with block: its exit would wait for every queued tag after a Ctrl-C
+        executor = ThreadPoolExecutor(max_workers=tag_workers)
+        try:
+            # Each tag costs a HEAD round trip, so resolve them concurrently
+            futures = {executor.submit(self._resolve_tag, repository, tag): tag for tag in tags}
+            for future in as_completed(futures):
+                tag = futures[future]
+                try:
+                    digest = future.result()
+                except Exception as e:
+                    logger.error(f"    ❌ Failed to process tag {repository}:{tag}: {e}")
+                    digest = None
 
-            # Get manifest digest
-            digest = self.get_manifest_digest(repository, tag)
-            if not digest:
-                failed_count += 1
-                continue
+                if digest:
+                    digests[tag] = digest
+                else:
+                    failed_count += 1
+            digests, resumed_count = self._skip_resumed(repository, digests)
+
+            # Tags such as 'latest' often share a manifest with a versioned tag;
+            # delete each manifest once instead of getting 404s for the repeats
+            unique_digests = set(digests.values())
+            if len(unique_digests) < len(digests):
+                logger.info(f"  🔗 {repository}: {len(digests)} tags share {len(unique_digests)} manifests")
+
+            # Delete manifests referring to the tagged ones first, in one burst,
+            # so they are not left dangling for garbage collection
+            referrers = self._collect_referrers(executor, repository, unique_digests)
+            if referrers:
+                logger.info(f"  📎 {repository}: deleting {len(referrers)} referrers before their subjects")
+                list(executor.map(lambda digest: self.delete_manifest(repository, digest), referrers))
+
+            futures = {executor.submit(self.delete_manifest, repository, digest): digest
+                       for digest in unique_digests}
+            deleted = {}
+            for future in as_completed(futures):
+                digest = futures[future]
+                deleted[digest] = future.result()
+                if deleted[digest]:
+                    self._record_deletion(repository, digests, digest)
+        except BaseException:
+            self._abandon(executor)
+            raise
+        executor.shutdown()
+
+        return self._finish_repository(repository, digests, deleted, resumed_count, failed_count)
 
-            # Delete manifest
-            if self.delete_manifest(repository, digest):
-                deleted_count += 1
+    def _async_client(self) -> httpx.AsyncClient:
+        """Create an async client configured like the threaded one."""
+        return httpx.AsyncClient(
+            http2=True,
+            verify=self.verify_ssl,
+            auth=self.client.auth,
+            limits=httpx.Limits(max_connections=ASYNC_CONCURRENCY, max_keepalive_connections=ASYNC_CONCURRENCY),
+            timeout=REQUEST_TIMEOUT,
+            follow_redirects=True
+        )
+
+    async def _a_request_nonraising(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                                    method: str, path: str, ok_status: Tuple[int, ...] = (200,),
+                                    **kwargs) -> Tuple[Optional[httpx.Response], Optional[int]]:
+        """Async counterpart of _request_nonraising, throttled by the shared semaphore."""
+        url = self._base + path
+        for attempt in range(RETRY_ATTEMPTS + 1):
+            try:
+                async with semaphore:
+                    response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt == RETRY_ATTEMPTS:
+                    raise
+                logger.debug(f"Retrying {method} {url} after {e}")
             else:
+                if response.status_code not in RETRY_STATUSES or attempt == RETRY_ATTEMPTS:
+                    break
+                logger.debug(f"Retrying {method} {url} after HTTP {response.status_code}")
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+        if response.status_code in ok_status:
+            return response, None
+        return None, response.status_code
+
+    async def _a_process_tag(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                             repository: str, tag: str) -> Optional[str]:
+        """Async counterpart of _resolve_tag."""
+        logger.debug(f"  🏷 Processing tag: {repository}:{tag}")
+        response, status = await self._a_request_nonraising(
+            client, semaphore,
+            'HEAD',
+            f'/{repository}/manifests/{tag}',
+            headers={'Accept': ', '.join(MANIFEST_TYPES)}
+        )
+        return self._digest_from_head(repository, tag, response, status)
+
+    async def _a_delete_manifest(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                                 repository: str, digest: str) -> bool:
+        """Async counterpart of delete_manifest."""
+        if self.dry_run:
+            logger.info(f"    🔍 DRY RUN: Would delete manifest {repository}@{digest}")
+            return True
+        if self._stop.is_set():
+            return False
+
+        try:
+            _, status = await self._a_request_nonraising(client, semaphore, 'DELETE',
+                                                         f'/{repository}/manifests/{digest}',
+                                                         ok_status=(202, 204))
+        except Exception as e:
+            logger.error(f"    ❌ Failed to delete manifest {repository}@{digest}: {e}")
+            return False
+        return self._deletion_succeeded(repository, digest, status)
+
+    async def _a_list_referrers(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                                repository: str, digest: str) -> List[str]:
+        """Async counterpart of list_referrers."""
+        if self._referrers_supported is False:
+            return []
+        try:
+            response, status = await self._a_request_nonraising(
+                client, semaphore,
+                'GET',
+                f'/{repository}/referrers/{digest}',
+                headers={'Accept': 'application/vnd.oci.image.index.v1+json'}
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"    ⚠ Failed to list referrers of {repository}@{digest}: {e}")
+            return []
+        return self._parse_referrers(response, status)
+
+    async def _a_collect_referrers(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                                   repository: str, digests: Set[str]) -> Set[str]:
+        """Async counterpart of _collect_referrers."""
+        referrers = set()
+        frontier = set(digests)
+        while frontier and self._referrers_supported is not False:
+            found = set()
+            for children in await asyncio.gather(
+                    *(self._a_list_referrers(client, semaphore, repository, digest) for digest in frontier)):
+                found.update(children)
+            frontier = found - referrers - digests
+            referrers |= frontier
+        return referrers
+
+    async def _a_cleanup_repository(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                                    repository: str) -> Tuple[int, int]:
+        """Clean up all tags in a repository with one task per request."""
+        logger.info(f"🧹 Cleaning up repository: {repository}")
+
+        # Listing reuses the threaded path (pagination, cache) off the event loop
+        tags = await asyncio.to_thread(self.list_tags, repository)
+        if not tags:
+            return 0, 0
+
+        if self.bulk_delete:
+            result = await asyncio.to_thread(self._bulk_delete_repository, repository, tags)
+            if result is not None:
+                return result
+
+        digests = {}
+        failed_count = 0
+
+        tasks = [asyncio.create_task(self._a_process_tag(client, semaphore, repository, tag)) for tag in tags]
+        for tag, result in zip(tags, await asyncio.gather(*tasks, return_exceptions=True)):
+            if isinstance(result, Exception):
+                logger.error(f"    ❌ Failed to process tag {repository}:{tag}: {result}")
                 failed_count += 1
+            elif result:
+                digests[tag] = result
+            else:
+                failed_count += 1
+        digests, resumed_count = self._skip_resumed(repository, digests)
 
-        print(f"  📊 Repository '{repository}': {deleted_count} deleted, {failed_count} failed")
-        return deleted_count, failed_count
+        unique_digests = list(set(digests.values()))
+        if len(unique_digests) < len(digests):
+            logger.info(f"  🔗 {repository}: {len(digests)} tags share {len(unique_digests)} manifests")
+
+        referrers = await self._a_collect_referrers(client, semaphore, repository, set(unique_digests))
+        if referrers:
+            logger.info(f"  📎 {repository}: deleting {len(referrers)} referrers before their subjects")
+            await asyncio.gather(*(self._a_delete_manifest(client, semaphore, repository, digest)
+                                   for digest in referrers))
+
+        tasks = [asyncio.create_task(self._a_delete_manifest(client, semaphore, repository, digest))
+                 for digest in unique_digests]
+        deleted = dict(zip(unique_digests, await asyncio.gather(*tasks)))
+        for digest, ok in deleted.items():
+            if ok:
+                self._record_deletion(repository, digests, digest)
+
+        return self._finish_repository(repository, digests, deleted, resumed_count, failed_count)
+
+    async def cleanup_repositories_async(self, repositories: List[str]) -> Dict[str, Tuple[int, int]]:
+        """Clean up several repositories on one event loop, sharing a connection and request budget."""
+        semaphore = asyncio.Semaphore(ASYNC_CONCURRENCY)
+        async with self._async_client() as client:
+            outcomes = await asyncio.gather(
+                *(self._a_cleanup_repository(client, semaphore, repo) for repo in repositories),
+                return_exceptions=True
+            )
+
+        results = {}
+        for repo, outcome in zip(repositories, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"❌ Failed to clean up repository '{repo}': {outcome}")
+                outcome = (0, 0)
+            results[repo] = outcome
+        return results
+
+    async def cleanup_repository_async(self, repository: str) -> Tuple[int, int]:
+        """Async counterpart of cleanup_repository."""
+        results = await self.cleanup_repositories_async([repository])
+        return results[repository]
 
     def cleanup_repositories_by_pattern(self, pattern: str) -> Dict[str, Tuple[int, int]]:
         """Clean up repositories matching a pattern (supports wildcards)."""
-        print(f"\n🔍 Finding repositories matching pattern: {pattern}")
-
-        repositories = self.list_repositories()
-        if not repositories:
-            print("❌ No repositories found")
-            return {}
+        logger.info(f"🔍 Finding repositories matching pattern: {pattern}")
 
-        # Convert shell-style pattern to regex
-        regex_pattern = pattern.replace('*', '.*').replace('?', '.')
-        regex = re.compile(f'^{regex_pattern}$')
+        # Fail before touching the registry rather than blocking on a prompt nobody can answer
+        needs_confirmation = not self.dry_run and not self.assume_yes
+        if needs_confirmation and not sys.stdin.isatty():
+            raise RuntimeError("Confirmation required but stdin is not a terminal; pass --yes to skip it")
 
-        matching_repos = [repo for repo in repositories if regex.match(repo)]
+        if not any(char in pattern for char in '*?'):
+            # A pattern without wildcards names a single repository; skip the catalog
+            matching_repos = [pattern] if self.repository_exists(pattern) else []
+        else:
+            # Only scan the part of the catalog that can match, filtering as it streams in
+            regex = _wildcard_to_regex(pattern)
+            repositories = self.list_repositories_with_prefix(_literal_prefix(pattern))
+            matching_repos = [repo for repo in repositories if regex.match(repo)]
 
         if not matching_repos:
-            print(f"❌ No repositories match pattern: {pattern}")
+            logger.error(f"❌ No repositories match pattern: {pattern}")
             return {}
 
-        print(f"✓ Found {len(matching_repos)} repositories matching pattern:")
+        logger.info(f"✓ Found {len(matching_repos)} repositories matching pattern:")
         for repo in matching_repos:
-            print(f"  - {repo}")
+            logger.info(f"  - {repo}")
 
         # Confirm deletion if not in dry-run mode
-        if not self.dry_run:
-            print(f"\n⚠ This will delete ALL images in {len(matching_repos)} repositories!")
+        if needs_confirmation:
+            logger.warning(f"⚠ This will delete ALL images in {len(matching_repos)} repositories!")
+            for handler in logging.getLogger().handlers:
+                handler.flush()
             confirm = input("Type 'yes' to confirm deletion: ")
             if confirm.lower() != 'yes':
-                print("❌ Operation cancelled")
+                logger.error("❌ Operation cancelled")
                 return {}
 
-        results = {}
-        total_deleted = 0
-        total_failed = 0
+        if self.use_async:
+            try:
+                results = asyncio.run(self.cleanup_repositories_async(matching_repos))
+            except BaseException:
+                self._stop.set()
+                raise
+        else:
+            results = {}
+            executor = ThreadPoolExecutor(max_workers=REPOSITORY_WORKERS)
+            try:
+                futures = {
+                    executor.submit(self.cleanup_repository, repo, NESTED_TAG_WORKERS): repo
+                    for repo in matching_repos
+                }
+                for future in as_completed(futures):
+                    repo = futures[future]
+                    try:
+                        results[repo] = future.result()
+                    except Exception as e:
+                        logger.error(f"❌ Failed to clean up repository '{repo}': {e}")
+                        results[repo] = (0, 0)
+            except BaseException:
+                self._abandon(executor)
+                raise
+            executor.shutdown()
 
-        for repo in matching_repos:
-            deleted, failed = self.cleanup_repository(repo)
-            results[repo] = (deleted, failed)
-            total_deleted += deleted
-            total_failed += failed
+        total_deleted = sum(deleted for deleted, _ in results.values())
+        total_failed = sum(failed for _, failed in results.values())
 
-        print(f"\n📊 TOTAL SUMMARY:")
-        print(f"  Repositories processed: {len(matching_repos)}")
-        print(f"  Images deleted: {total_deleted}")
-        print(f"  Failed deletions: {total_failed}")
+        logger.info("📊 TOTAL SUMMARY:")
+        logger.info(f"  Repositories processed: {len(matching_repos)}")
+        logger.info(f"  Images deleted: {total_deleted}")
+        logger.info(f"  Failed deletions: {total_failed}")
 
         return results
 
     def show_registry_info(self):
         """Display information about the registry."""
-        print(f"\n📡 Registry Information")
-        print(f"  URL: {self.registry_url}")
+        logger.info("📡 Registry Information")
+        logger.info(f"  URL: {self.registry_url}")
 
         try:
             # Test connectivity
             response = self._make_request('GET', '/')
-            print(f"  ✓ Registry is accessible")
+            logger.info("  ✓ Registry is accessible")
         except Exception as e:
-            print(f"  ❌ Registry is not accessible: {e}")
+            logger.error(f"  ❌ Registry is not accessible: {e}")
             return
 
-        # List repositories
-        repositories = self.list_repositories()
+        # Only pull the repositories that are shown, plus one to tell whether more exist
+        repo_iter = self.list_repositories(page_size=INFO_REPOSITORY_LIMIT + 1)
+        repositories = list(itertools.islice(repo_iter, INFO_REPOSITORY_LIMIT + 1))
+        repo_iter.close()
         if repositories:
-            print(f"\n📋 Repositories ({len(repositories)}):")
-            for repo in repositories[:10]:  # Show first 10
-                tags = self.list_tags(repo)
-                print(f"  - {repo} ({len(tags)} tags)")
+            shown = repositories[:INFO_REPOSITORY_LIMIT]
+            with ThreadPoolExecutor(max_workers=REPOSITORY_WORKERS) as executor:
+                # If the whole catalog fit, the count is already known; otherwise use the
+                # registry's count or finish counting the catalog while the tags are fetched
+                remaining = None
+                if len(repositories) <= INFO_REPOSITORY_LIMIT:
+                    total = len(repositories)
+                else:
+                    total = self.get_catalog_count()
+                    if total is None:
+                        remaining = executor.submit(self._count_catalog_after, repositories[-1])
+
+                tag_lists = list(executor.map(self.list_tags, shown))
+
+                if remaining is not None and remaining.result() is not None:
+                    total = len(repositories) + remaining.result()
 
-            if len(repositories) > 10:
-                print(f"  ... and {len(repositories) - 10} more repositories")
+            logger.info(f"📋 Repositories ({total}):" if total is not None else "📋 Repositories:")
+            for repo, tags in zip(shown, tag_lists):
+                logger.info(f"  - {repo} ({len(tags)} tags)")
+
+            if len(repositories) > INFO_REPOSITORY_LIMIT:
+                if total is not None:
+                    logger.info(f"  ... and {total - INFO_REPOSITORY_LIMIT} more repositories")
+                else:
+                    logger.info("  ... and more repositories")
+
+
+def configure_logging(verbose: bool = False):
+    """Send log records to stdout, batching writes when output is redirected."""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+    if not sys.stdout.isatty():
+        # Nobody is watching line by line, so write in batches; errors flush immediately
+        handler = logging.handlers.MemoryHandler(LOG_BUFFER_SIZE, flushLevel=logging.ERROR, target=handler)
+    logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO, handlers=[handler])
+
+    # httpx logs every request at INFO; only show that with --verbose
+    if not verbose:
+        logging.getLogger('httpx').setLevel(logging.WARNING)
 
 
 def main():
@@ -271,6 +964,9 @@ Examples:
   # Dry run (preview what would be deleted)
   python3 cleanup_registry.py --registry https://registry.cluster:5000 --pattern "bdtemp*" --dry-run
 
+  # Non-interactive cleanup (e.g. from cron or CI)
+  python3 cleanup_registry.py --registry https://registry.cluster:5000 --pattern "bdtemp*" --yes
+
   # With authentication
   python3 cleanup_registry.py --registry https://registry.cluster:5000 --username admin --password secret --pattern "bdtemp*"
         """
@@ -302,11 +998,42 @@ Examples:
         action='store_true',
         help='Preview what would be deleted without actually deleting'
     )
+    parser.add_argument(
+        '--yes',
+        action='store_true',
+        help='Skip the confirmation prompt for pattern cleanups (required when not run from a terminal)'
+    )
     parser.add_argument(
         '--info',
         action='store_true',
         help='Show registry information and exit'
     )
+    parser.add_argument(
+        '--async',
+        dest='use_async',
+        action='store_true',
+        help='Issue requests from an asyncio event loop instead of worker threads (for very large repositories)'
+    )
+    parser.add_argument(
+        '--bulk',
+        action='store_true',
+        help='Delete whole repositories in one request when the registry supports it (Harbor)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        default=DEFAULT_CACHE_DIR,
+        help=f'Directory for the tag listing and resume cache (default: {DEFAULT_CACHE_DIR}, requires diskcache)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the on-disk cache'
+    )
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+        help='Log per-tag progress and HTTP retry details'
+    )
     parser.add_argument(
         '--verify-ssl',
         action='store_true',
@@ -314,15 +1041,16 @@ Examples:
     )
 
     args = parser.parse_args()
+    configure_logging(args.verbose)
 
     # Validate arguments
     if not args.info and not args.pattern and not args.repository:
-        print("❌ Error: Must specify --pattern, --repository, or --info")
+        logger.error("❌ Error: Must specify --pattern, --repository, or --info")
         parser.print_help()
         sys.exit(1)
 
     if args.pattern and args.repository:
-        print("❌ Error: Cannot specify both --pattern and --repository")
+        logger.error("❌ Error: Cannot specify both --pattern and --repository")
         sys.exit(1)
 
     # Initialize cleanup client
@@ -332,10 +1060,14 @@ Examples:
             username=args.username,
             password=args.password,
             verify_ssl=args.verify_ssl,
-            dry_run=args.dry_run
+            dry_run=args.dry_run,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            assume_yes=args.yes,
+            use_async=args.use_async,
+            bulk=args.bulk
         )
     except Exception as e:
-        print(f"❌ Failed to initialize registry client: {e}")
+        logger.error(f"❌ Failed to initialize registry client: {e}")
         sys.exit(1)
 
     # Execute requested operation
@@ -345,18 +1077,21 @@ Examples:
         elif args.pattern:
             cleanup.cleanup_repositories_by_pattern(args.pattern)
         elif args.repository:
-            deleted, failed = cleanup.cleanup_repository(args.repository)
-            print(f"\n📊 SUMMARY: {deleted} deleted, {failed} failed")
+            if args.use_async:
+                deleted, failed = asyncio.run(cleanup.cleanup_repository_async(args.repository))
+            else:
+                deleted, failed = cleanup.cleanup_repository(args.repository)
+            logger.info(f"📊 SUMMARY: {deleted} deleted, {failed} failed")
 
         if not args.dry_run and (args.pattern or args.repository):
-            print(f"\n💡 Remember to run garbage collection on your registry to free disk space:")
-            print(f"   docker exec <registry_container> /bin/registry garbage-collect /etc/docker/registry/config.yml")
+            logger.info("💡 Remember to run garbage collection on your registry to free disk space:")
+            logger.info("   docker exec <registry_container> /bin/registry garbage-collect /etc/docker/registry/config.yml")
 
     except KeyboardInterrupt:
-        print(f"\n⚠ Operation interrupted by user")
+        logger.warning("⚠ Operation interrupted by user")
         sys.exit(1)
     except Exception as e:
-        print(f"❌ Operation failed: {e}")
+        logger.error(f"❌ Operation failed: {e}")
         sys.exit(1)
 
 
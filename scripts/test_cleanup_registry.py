@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for cleanup_registry.py
+
+Run with:
+    python3 -m unittest test_cleanup_registry
+"""
+
+import unittest
+
+import httpx
+
+from cleanup_registry import RegistryCleanup, _distribution_sort_key, _literal_prefix, _wildcard_to_regex
+
+REPOSITORIES = [
+    'a', 'tea', 'te/am', 'tbam/x', 'team', 'team-x', 'team-a/b', 'team.y', 'team/app',
+    'team/app/x', 'team/web', 'team0', 'teamz', 'tzam/q', 'zzz',
+]
+
+PATTERNS = ['team/*', 'team-*', 'team*', 'team.*', 't?am/*', 'team/a*', 'nomatch*']
+
+# Registries may return fewer entries than asked for; small pages exercise the Link handling
+CATALOG_PAGE_SIZE = 2
+
+
+def _catalog_transport(sort_key):
+    """Serve a paginated _catalog sorted by sort_key, like a registry would."""
+    names = sorted(REPOSITORIES, key=sort_key)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == '/v2/_catalog'
+        page_size = min(int(request.url.params.get('n', CATALOG_PAGE_SIZE)), CATALOG_PAGE_SIZE)
+        last = request.url.params.get('last')
+        remaining = [name for name in names if last is None or sort_key(name) > sort_key(last)]
+        page = remaining[:page_size]
+
+        headers = {}
+        if len(remaining) > page_size:
+            headers['Link'] = f'</v2/_catalog?n={page_size}&last={page[-1]}>; rel="next"'
+        return httpx.Response(200, json={'repositories': page}, headers=headers)
+
+    return httpx.MockTransport(handler)
+
+
+class PrefixScanTest(unittest.TestCase):
+    """The prefix scan must find exactly what a full catalog scan finds."""
+
+    def _cleanup(self, sort_key):
+        cleanup = RegistryCleanup('http://registry.test', cache_dir=None)
+        cleanup.client = httpx.Client(transport=_catalog_transport(sort_key))
+        self.addCleanup(cleanup.client.close)
+        return cleanup
+
+    def _check_order(self, sort_key):
+        cleanup = self._cleanup(sort_key)
+        full_scan = list(cleanup.list_repositories())
+        self.assertEqual(full_scan, sorted(REPOSITORIES, key=sort_key))
+
+        for pattern in PATTERNS:
+            with self.subTest(pattern=pattern):
+                regex = _wildcard_to_regex(pattern)
+                expected = [repo for repo in full_scan if regex.match(repo)]
+                scanned = cleanup.list_repositories_with_prefix(_literal_prefix(pattern))
+                self.assertEqual([repo for repo in scanned if regex.match(repo)], expected)
+
+    def test_byte_order(self):
+        self._check_order(lambda name: name)
+
+    def test_distribution_order(self):
+        # Docker distribution sorts '/' before every other character
+        self._check_order(_distribution_sort_key)
+
+    def test_orders_differ(self):
+        # Guard against the two catalogs accidentally coinciding
+        self.assertNotEqual(sorted(REPOSITORIES), sorted(REPOSITORIES, key=_distribution_sort_key))
+
+
+if __name__ == '__main__':
+    unittest.main()